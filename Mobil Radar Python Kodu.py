@@ -5,10 +5,13 @@ Raspberry Pi Pico W - MicroPython Implementation
 
 import network
 import socket
+import uasyncio as asyncio
 import time
-import json
-from machine import Pin, PWM
-import _thread
+import array
+import binascii
+from machine import Pin, PWM, Timer
+import micropython
+from micropython import const
 
 # ==================== CONFIGURATION ====================
 
@@ -17,23 +20,47 @@ SSID = "Wifi adı"
 PASSWORD = "Wifi Şifresi"
 
 # Pin Assignments (FIXED - DO NOT CHANGE)
-RADAR_SERVO_PIN = 15    # GP15
-WHEEL_SERVO_1_PIN = 11  # GP11
-WHEEL_SERVO_2_PIN = 10  # GP10
-TRIG_PIN = 17           # GP17
-ECHO_PIN = 18           # GP18
-BUZZER_PIN = 16         # GP16
-BLUE_LED_PIN = 4        # GP4
-RED_LED_PIN = 3         # GP3
-GREEN_LED_PIN = 5       # GP5
+RADAR_SERVO_PIN = const(15)    # GP15
+WHEEL_SERVO_1_PIN = const(11)  # GP11
+WHEEL_SERVO_2_PIN = const(10)  # GP10
+TRIG_PIN = const(17)           # GP17
+ECHO_PIN = const(18)           # GP18
+BUZZER_PIN = const(16)         # GP16
+BLUE_LED_PIN = const(4)        # GP4
+RED_LED_PIN = const(3)         # GP3
+GREEN_LED_PIN = const(5)       # GP5
 
 # Servo Parameters
-SERVO_FREQ = 50  # 50Hz for standard servos
-MIN_DUTY = 1000  # Minimum pulse width (μs)
-MAX_DUTY = 9000  # Maximum pulse width (μs)
+# Pulse widths keep the original duty_u16 calibration (count * 20 ms / 65536)
+SERVO_FREQ = const(50)             # 50Hz for standard servos
+SERVO_MIN_NS = const(305_176)      # Pulse width at 0° (ns), was duty 1000
+SERVO_NS_PER_DEG = const(13_563)   # Pulse width step per degree (ns), up to duty 9000 at 180°
+WHEEL_STOP_NS = const(1_500_000)   # Continuous servo stop pulse (ns), was duty 4915
+WHEEL_NS_PER_SPEED = const(6_007)  # Pulse width step per speed unit (ns), was 19.685 counts
+SETTLE_BASE_MS = const(20)         # Radar servo settle time, fixed part (ms)
+SETTLE_MS_PER_DEG = const(3)       # Radar servo settle time per degree moved (ms)
+
+# Precomputed radar servo pulse width for every whole degree (0-180)
+_DUTY_TABLE = array.array('L', [SERVO_MIN_NS + a * SERVO_NS_PER_DEG for a in range(181)])
+
+# Precomputed wheel servo pulse width for the speeds actually used
+_FWD_DUTY = const(WHEEL_STOP_NS + 50 * WHEEL_NS_PER_SPEED)
+_REV_DUTY = const(WHEEL_STOP_NS - 50 * WHEEL_NS_PER_SPEED)
+_STOP_DUTY = const(WHEEL_STOP_NS)
+_SPEED_DUTY = {50: _FWD_DUTY, -50: _REV_DUTY, 0: _STOP_DUTY}
+
+# Radar sweep: 0-180° in 5° steps
+SCAN_STEP = const(5)
+SCAN_SLOTS = const(37)
 
 # Distance threshold for buzzer (cm)
-DISTANCE_THRESHOLD = 30
+DISTANCE_THRESHOLD = const(30)
+
+# ticks_us() wraps at 2**30 on the RP2040
+_TICKS_MASK = const(0x3FFFFFFF)
+
+# Reuse the previous sweep for this long while the robot is idle (ms)
+SCAN_CACHE_MS = const(2000)
 
 # ==================== GLOBAL STATE ====================
 
@@ -41,12 +68,21 @@ class SystemState:
     def __init__(self):
         self.active = False
         self.scanning = False
+        self.moving = False
         self.current_angle = 90
         self.last_distance = 0
-        self.scan_data = {}  # {angle: distance}
+        self.scan_data = array.array('H', [0] * SCAN_SLOTS)  # cm per step, 0 = no echo
         
 state = SystemState()
-state_lock = _thread.allocate_lock()
+
+# Echo timestamps written by the echo pin IRQ, which sets the flag on echo end
+_rise_ts = 0
+_fall_ts = 0
+_echo_flag = asyncio.ThreadSafeFlag()
+
+# Sweep cache bookkeeping
+_last_scan_ts = 0
+_moved_since_scan = True
 
 # ==================== HARDWARE SETUP ====================
 
@@ -55,8 +91,9 @@ red_led = Pin(RED_LED_PIN, Pin.OUT)
 green_led = Pin(GREEN_LED_PIN, Pin.OUT)
 blue_led = Pin(BLUE_LED_PIN, Pin.OUT)
 
-# Buzzer
+# Buzzer (switched off by a one-shot timer)
 buzzer = Pin(BUZZER_PIN, Pin.OUT)
+beep_timer = Timer()
 
 # Ultrasonic Sensor
 trig = Pin(TRIG_PIN, Pin.OUT)
@@ -73,63 +110,83 @@ wheel_servo_2.freq(SERVO_FREQ)
 
 # ==================== HELPER FUNCTIONS ====================
 
+@micropython.native
 def set_servo_angle(servo, angle):
     """Set servo to specific angle (0-180)"""
-    angle = max(0, min(180, angle))
-    duty = int(MIN_DUTY + (angle / 180) * (MAX_DUTY - MIN_DUTY))
-    servo.duty_u16(duty)
+    servo.duty_ns(_DUTY_TABLE[max(0, min(180, int(angle)))])
 
 def set_continuous_servo(servo, speed):
     """
     Set continuous rotation servo speed
     speed: -100 (full reverse) to 100 (full forward), 0 = stop
     """
-    duty = int(4915 + (speed * 19.685))  # Map to 0-9830 range, ~4915 is center
-    servo.duty_u16(duty)
+    duty = _SPEED_DUTY.get(speed)
+    if duty is None:
+        duty = WHEEL_STOP_NS + speed * WHEEL_NS_PER_SPEED  # ~0.9-2.1 ms, 1.5 ms is center
+    servo.duty_ns(duty)
 
 def stop_servo(servo):
     """Stop servo by setting duty to 0"""
-    servo.duty_u16(0)
-
-def measure_distance():
+    servo.duty_ns(0)
+
+def _echo_isr(pin):
+    """Record echo rising/falling edge timestamps"""
+    global _rise_ts, _fall_ts
+    now = time.ticks_us()
+    # Edge type from the IRQ flags, not pin.value(), which may already
+    # have changed again on a short close-range pulse
+    flags = _echo_irq.flags()
+    if flags & Pin.IRQ_RISING:
+        _rise_ts = now
+    if flags & Pin.IRQ_FALLING:
+        _fall_ts = now
+        _echo_flag.set()
+
+@micropython.viper
+def _pulse_us(rise: int, fall: int) -> int:
+    """Echo pulse width (μs) from two wrapping ticks_us() timestamps"""
+    return (fall - rise) & _TICKS_MASK
+
+# Hard IRQ: the handler runs straight from the interrupt with interrupts
+# masked, so edge timestamps are not delayed by the interpreter and need no
+# extra locking (it allocates nothing, as required)
+_echo_irq = echo.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=_echo_isr, hard=True)
+
+async def measure_distance():
     """Measure distance using ultrasonic sensor (returns cm)"""
+    _echo_flag.clear()
+    
     trig.value(0)
     time.sleep_us(2)
     trig.value(1)
     time.sleep_us(10)
     trig.value(0)
     
-    timeout = 30000  # 30ms timeout
-    start = time.ticks_us()
-    
-    # Wait for echo start
-    while echo.value() == 0:
-        if time.ticks_diff(time.ticks_us(), start) > timeout:
-            return -1
-    pulse_start = time.ticks_us()
-    
-    # Wait for echo end
-    while echo.value() == 1:
-        if time.ticks_diff(time.ticks_us(), pulse_start) > timeout:
-            return -1
-    pulse_end = time.ticks_us()
+    # Yield until the IRQ reports the echo end (30ms timeout)
+    try:
+        await asyncio.wait_for_ms(_echo_flag.wait(), 30)
+    except asyncio.TimeoutError:
+        return -1
     
-    pulse_duration = time.ticks_diff(pulse_end, pulse_start)
-    distance = (pulse_duration * 0.0343) / 2
+    pulse_duration = _pulse_us(_rise_ts, _fall_ts)
+    distance = pulse_duration * 343 // 20000  # 0.0343 cm/μs, there and back
     
     return distance if distance < 400 else -1
 
+def _buzzer_off(timer):
+    """Timer callback ending a beep"""
+    buzzer.value(0)
+
 def beep(duration_ms=100):
-    """Sound buzzer for specified duration"""
+    """Sound buzzer for specified duration without blocking"""
     buzzer.value(1)
-    time.sleep_ms(duration_ms)
-    buzzer.value(0)
+    beep_timer.init(period=duration_ms, mode=Timer.ONE_SHOT, callback=_buzzer_off)
 
 def enter_sleep_mode():
     """Enter sleep mode - deactivate all systems"""
-    with state_lock:
-        state.active = False
-        state.scanning = False
+    state.active = False
+    state.scanning = False
+    state.moving = False
     
     # Stop all servos
     stop_servo(radar_servo)
@@ -148,8 +205,7 @@ def enter_sleep_mode():
 
 def activate_system():
     """Activate system from sleep mode"""
-    with state_lock:
-        state.active = True
+    state.active = True
     
     # LED status
     red_led.value(0)
@@ -171,80 +227,110 @@ def activate_system():
 
 def move_forward():
     """Move robot forward"""
+    global _moved_since_scan
     if not state.active:
         return
+    state.moving = True
+    _moved_since_scan = True
     set_continuous_servo(wheel_servo_1, 50)
     set_continuous_servo(wheel_servo_2, -50)
 
 def move_reverse():
     """Move robot in reverse"""
+    global _moved_since_scan
     if not state.active:
         return
+    state.moving = True
+    _moved_since_scan = True
     set_continuous_servo(wheel_servo_1, -50)
     set_continuous_servo(wheel_servo_2, 50)
 
 def turn_left():
     """Pivot turn left"""
+    global _moved_since_scan
     if not state.active:
         return
+    state.moving = True
+    _moved_since_scan = True
     set_continuous_servo(wheel_servo_1, -50)
     set_continuous_servo(wheel_servo_2, -50)
 
 def turn_right():
     """Pivot turn right"""
+    global _moved_since_scan
     if not state.active:
         return
+    state.moving = True
+    _moved_since_scan = True
     set_continuous_servo(wheel_servo_1, 50)
     set_continuous_servo(wheel_servo_2, 50)
 
 def stop_movement():
     """Stop all movement"""
+    state.moving = False
     set_continuous_servo(wheel_servo_1, 0)
     set_continuous_servo(wheel_servo_2, 0)
 
 # ==================== RADAR FUNCTIONS ====================
 
-def radar_scan_thread():
-    """Background thread for radar scanning"""
+async def radar_scan_task():
+    """Background task for radar scanning"""
+    global _last_scan_ts, _moved_since_scan
     while True:
         if state.active and state.scanning:
             blue_led.value(1)
             
-            # Scan from 0 to 180
-            for angle in range(0, 181, 5):
+            full_sweep = (state.moving or _moved_since_scan or not any(state.scan_data) or
+                          time.ticks_diff(time.ticks_ms(), _last_scan_ts) >= SCAN_CACHE_MS)
+            if full_sweep:
+                # Scan from 0 to 180; any move during the sweep marks it stale again
+                _moved_since_scan = False
+                angles = range(0, 181, SCAN_STEP)
+            else:
+                # Robot idle since last sweep: only refresh around current angle
+                center = state.current_angle
+                angles = [a for a in (center - SCAN_STEP, center, center + SCAN_STEP) if 0 <= a <= 180]
+            
+            for angle in angles:
                 if not state.scanning or not state.active:
                     break
                 
+                # Wait in proportion to how far the servo has to travel
+                delta = abs(angle - state.current_angle)
                 set_servo_angle(radar_servo, angle)
                 state.current_angle = angle
-                time.sleep_ms(100)
+                await asyncio.sleep_ms(SETTLE_BASE_MS + delta * SETTLE_MS_PER_DEG)
                 
-                distance = measure_distance()
+                distance = await measure_distance()
                 if distance > 0:
                     state.last_distance = distance
-                    state.scan_data[angle] = distance
+                    state.scan_data[angle // SCAN_STEP] = distance
                     
                     # Check for proximity warning
                     if distance < DISTANCE_THRESHOLD:
                         beep(50)
+            else:
+                if full_sweep:
+                    _last_scan_ts = time.ticks_ms()
             
             # Scan complete beep
-            if state.scanning:
+            if full_sweep and state.scanning:
                 beep(200)
             
             blue_led.value(0)
             
             # Brief pause before next scan
-            time.sleep(0.5)
+            await asyncio.sleep_ms(500)
         else:
             blue_led.value(0)
-            time.sleep(0.1)
+            await asyncio.sleep_ms(100)
 
 def start_scanning():
     """Start radar scanning"""
     if state.active:
         state.scanning = True
-        state.scan_data = {}
+        for i in range(SCAN_SLOTS):
+            state.scan_data[i] = 0
 
 def stop_scanning():
     """Stop radar scanning"""
@@ -491,10 +577,10 @@ HTML_PAGE = """<!DOCTYPE html>
                 ctx.beginPath();
                 
                 let first = true;
-                for (let a = 0; a <= 180; a += 5) {
-                    if (scanData[a]) {
-                        const radians = (a - 90) * Math.PI / 180;
-                        const dist = Math.min(scanData[a] / 2, maxRadius);
+                for (let i = 0; i < scanData.length; i++) {
+                    if (scanData[i]) {
+                        const radians = (i * 5 - 90) * Math.PI / 180;
+                        const dist = Math.min(scanData[i] / 2, maxRadius);
                         const x = centerX + dist * Math.cos(radians);
                         const y = centerY + dist * Math.sin(radians);
                         
@@ -556,7 +642,7 @@ HTML_PAGE = """<!DOCTYPE html>
             // Distance display
             const distEl = document.getElementById('distance');
             if (data.distance > 0) {
-                distEl.textContent = data.distance.toFixed(1) + ' cm';
+                distEl.textContent = data.distance + ' cm';
                 distEl.className = 'distance-value' + (data.distance < 30 ? ' warning' : '');
             } else {
                 distEl.textContent = '-- cm';
@@ -586,105 +672,199 @@ HTML_PAGE = """<!DOCTYPE html>
                 .then(updateStatus);
         }
         
-        function updateData() {
-            fetch('/status')
-                .then(r => r.json())
-                .then(updateStatus)
-                .catch(e => console.error('Error:', e));
-        }
-        
         // Initial draw
-        drawRadar(90, 0, {});
+        drawRadar(90, 0, []);
         
-        // Update every 200ms
-        setInterval(updateData, 200);
+        // Status pushed every 200ms over one long-lived connection
+        const events = new EventSource('/events');
+        events.onmessage = e => updateStatus(JSON.parse(e.data));
     </script>
 </body>
 </html>
 """
 
+# HTML_PAGE compressed with gzip -9 and base64 encoded
+# (regenerate with tools/regen_html_gz.py whenever HTML_PAGE changes)
+HTML_PAGE_GZ = binascii.a2b_base64(
+    'H4sIAAAAAAACA9Uay27jyPE+X9HRYFbUjChRkjVjy5I2E1sDTDAvjI0kxmKxaJFNiWuKFJot'
+    'P7IwkEMetwwQ7CmHLBbIMUBy3FzzKfsD2U9IdTefzaZEe5xF4l2Pxe6q6npXdVHjnxy/PTo9'
+    'ezdDS7bypw/GyR+CnekDBD9j5jGfTN9jB1N0FAaMhv64KxclwIowjAK8IpPGhUcu1yFlDWQD'
+    'JAnYpHHpOWw5cciFZxNTPLSRF3jMw74Z2dgnk14jJhSx64Qo/3mMvkIrTBdeMELWIVpjx/GC'
+    'hfg8D6/MyPu1eJyH1CHUhKVDdJMiz0PnGvDTZ/7jAk+mi1eefz1Czylw0EYRDiIzItRzD4vA'
+    'c2yfL2i4CZwR8r2AYGouKHY8EMroDYYOWbTRwx4Z2M/6yHoEn/t42D/YRz3LetQ6LJCyQz+k'
+    'I3S59Bgp7qQy9a31VXFr5QXmkniLJRtxmhfLbDuTssPVjIE7KnR1JRUMCH2LE8zUh/CGhXn9'
+    'LHuAwcgVM7HvLQDEBsEITVBAnYyFqxEaCDoCMFpiJ7wEXtdX4ncPfulijg2rLf7rDFv5EzoR'
+    'w2wTmWscEB99ValcQaI/HLaTX6vTUxTIwR0ark3X84FJsLm/oUYPWFMBpS9wO20iUMNQ1eo2'
+    'hRcFLwMIp4t1YKF9kH7QV1UwaGnNFKsC7L9SNOF40drH4I+uT5TzvtxEzHOvzTiURihaY4ih'
+    'OWGXhARFWGFEQT9KTakXvFch+AiBsiC2bmMna7hd//v5ozTqCBzPxiykik5iJy5bIIkHnW0K'
+    'Bw+tR4d6NXsBD2Zz7of2udb+NAm5Ct594piUOBA9eeU8JO4e/BwqTmIJOtmuQmdBwZAqpX7f'
+    'Hg5JFaVkV6EEAUFUQoP5ft99WkUo2VUIha5bovNsrzfs5SGL+QcKAkjiOVWezfeKquYrJvgq'
+    '7DMC/u1vVgFYjZI1wczgqQoinbV5DoSkZgx4Mmujnktbir8t8PrWoXxT5j4iNvPC4P8gSd09'
+    'By37aTlNFSOOlmURqimBhU6frLSWnm8AJdAHKi95VdlmeJtsIxQzQkEYkPp5Ja3ssQhPtZuX'
+    'ceqYh77ijPaGRrw8r0OvnDYZhf7A484xghzrI9BupEDw0ijA3JCCTjfrNaE2jojOCFKLo2V4'
+    'ISp2Dk185OFwZph97jKKqXmx7elMXaaOwZkvSCV5q6UP5TkLTIEKUFU5qdDJ5COJIzukCj1J'
+    'f1vRV6CUFVSuqjS2FRk6yVIi3Z8P7d2ILFyriO7wgFjzasSMAuVdsRlnOiU4RJKTuQ28EnWR'
+    '2dtRXHUB/LEJ4zb9ha5v2NpYZCp5KDRxhIMLHCl6yLelpUShilZOeHnDWG7vWR/rzs9MAgIz'
+    'HECfpLdKLlPwVFcO5WI7XDsv39WWld2YqNKWtmylIl5gUfZ1l40kZOtmwhz5S0wDEBOiIqGV'
+    'xC8OvBWWyXC98SOCehE0VC6/zhUC5Kfn5NqlcCOMYrgii/y6xF0BTgihpfUYuGehv+A/w+I+'
+    '3C7yEPLTuBtfGcddeWEd82tffJt0vAtk+ziKJo30ltTIbpfjZW/6wzd//Dt6Hc49n6DCBRed'
+    'XEfg8kC2Ny37WJ50/pKToy5P6E8lHXQioIBcXwEpU+KhphCSl2M4Yir+VRGSLrqBPGfSgN70'
+    'FXEaU9ANxzjxCVmDjA6JF/SUBWrEYSWrjen3v/lahzHuAsv/dSFEY5wX47msafXkkAXwf0IQ'
+    '3pcXzAF1igdXDWMA5O1EUB617prv1xvV0iuNsU4D4MrvwkuSmwmpzi3A4r4xppvvMRooDGzf'
+    's89jg8GS0QJZ//wten50+vIXz09n6OTs5HT2etyVVGqRz7qQ3AHZIj/ih2/+9Fd08mo2e4de'
+    'vz2e6clr/OMj1fU6bnBqayrpiHKCRCRwjsLVCgeO0YTWDnK10+Ra+9vv//3dB/RCrtxKYbtO'
+    'oQSa1YjIU/7AT3kvV+71FJ+4TB7xO37E6YYG6BWs3a8ovPKJU/7ybXrKe754q2N4z1h1BN8T'
+    'J3z4Jz/hBB5/LP9SRrQ1nYznmWphMGVfcIimCJuvf8srGWUoS2P3qLb0oO8/fJfors5JOUWp'
+    'zZ9GUwnK9DiG1RhiK2nRdMnsnqw1pqaJ7FUFJV2luYXxC3cMnelt2XWL4p914Q15O580hpbV'
+    'iCdnk8YAHqAWSZS61ST3MR7U29RbswwW/DNiKOZjgpzQ3vAw7CwIm/kiIn92/ZLHX8ZeM9cX'
+    'x+jsCnAlEY7JHRkacqPZd/LA6Qd3E8ipjUPxpfB9AwcLn7RRYpY24h51jBluqU0yu+q4nu+f'
+    '8PYRTm3GV4vmoRbsPcQddPQI/o/5i19kxE9Su0qnr3TlQkRxqfhVJqYgA1fD/mEl9FkGLY9B'
+    'Jtw/dPBw0XovrhUajD1rC3PdLjoGHSIK+iPI9qjtk6ikiAjSyjnJNNYjexZ2NRrjA9ZfCsEm'
+    'qKdeQCgyfMIQhb2hdQh/x5OMcf78hG+o9kpIzwncjd5htjQUZScAmNpGrOV2osA2om30GpA6'
+    '714KG7oY7iQVBKSUOvKlBa622NOQj+fEj7QUi372dO/Z3v68qT+c3884lLj7iRdUVYBA85QH'
+    'h0HRY9RvoSeoaa+a7dTDuI+kCoAnqgh0s9sbRDCJV1939IXU2BhgwNaY27q3Lz6BlQd6KwtX'
+    '5tdjHHBHNjBwfwCgjxMTQrhwInfzD94hnIYlF6mA5sIDtLY2JJp+kou7mEc7jIxYglZ7C/KZ'
+    'DjnyghS5hHsrp61hYzE2cyBBFnY9FxlVmbPKA+S4YYu7pqBiPDLYa6PewbM2OoAPfErSrLZA'
+    'kkv6d7B5aYH7o+vRiMcZoxtSRknd1pNu66FxWkc6PgkWbAmLT57oNKNq7zPv8yowrbN74AXD'
+    'ug5fpMKLHpAQOCvwoRwLvMC0M09r7SIl6nDq3oKwxrN3UblOqZwpVPIuXk2lcoMrWJhwm2qV'
+    'gL9qo+stZwm7x14hqkM16A0i5YnWluSx4+SbB/VWb+438O0NpXzWLpN8OrR4sD0VC+Aa3qlL'
+    'EHKMv6NdGJS3K8O7fjrflsrvnMbvksJbVWoyWjXaM4ew+D2leFVVStlJ24umyEKffJK2wZC/'
+    '9qwtxVbNHCnezrTxceni49LEzkKTE39goU/BBeUYu4lGu+pVrTaTB3YbDUVH2c/ioVVdAm8X'
+    'p89FtMX3vh23F9fVNeJJO8kn/eK9qLanLPSTTXEqKAhsIcMdOst//aPJB/YgptXa+vIlvZJt'
+    '1tBUxBNYw9G0ESDfq9lxlniKLWb1BVIMt5utjrgbv8ErIX7p6ySc+5IVBB+d+OUouEP8bQfh'
+    'DvGXOpqKgSr5SObT98eJoJjywvmqy0s8Yv4YVqJ4yJIww0lu40U1pTS0eH9Wj+fcmwbgm+Md'
+    'yZeQPG6Lynn74oVg5e2bZk2F5Mf/O6m/kcThkJrUs7m8nnZel2KOPRMnvDx+NWvuSPJJwtLG'
+    'fJqqZ/62EUuS9VSTiQLB+ctXCV1NkEfoJEsxISUguG0eVuEW/LA4N+NOqPCRpGcUv3cU6lLZ'
+    'r+y6tOw2xTjubgzeJkXLiavOXNlMSjpcPJjKC97O/OULkSLrpdb82NReOaoJXcLspdHswtan'
+    'WGBMuM45ZEkbHbYkUGLRZIpo58soDIxWFVA+oWtgIMPAqYRT4o4a+qRDKA2p0ZzxPyOoH6RV'
+    'U8DsTc1u0RLY5v0JV4/J/Aul3Wxm0D8Wo+CcL+WXrIUrPij75YGcZ372uW62muX09SZaEgfx'
+    'Nz7XUP+tVYTEl5fCgCA/DBamD5nU4VYPZHOqTHUBMWD89hCQSzTjDyfhhtoEFCS38pEuVzph'
+    'sCJRhBc8PIVPFdqJn5+8fdNZYxoRg3RE4MQUxt1kLj3uyu8BjLvy6+z/AYDNIufmLgAA'
+)
+
+# Complete main page response, built once at load
+HTML_PAGE_BYTES = ('HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Encoding: gzip\r\n'
+                   'Content-Length: %d\r\nConnection: close\r\n\r\n' % len(HTML_PAGE_GZ)).encode() + HTML_PAGE_GZ
+
+# Only the response above is served; free the page source and the extra blob copy
+del HTML_PAGE, HTML_PAGE_GZ
+
 def get_status_json():
     """Return current system status as JSON"""
-    with state_lock:
-        return json.dumps({
-            'active': state.active,
-            'scanning': state.scanning,
-            'angle': state.current_angle,
-            'distance': round(state.last_distance, 1),
-            'scan_data': state.scan_data
-        })
-
-def handle_request(client):
+    scan_data = ','.join(str(d) for d in state.scan_data)
+    return '{"active":%s,"scanning":%s,"angle":%d,"distance":%d,"scan_data":[%s]}' % (
+        'true' if state.active else 'false',
+        'true' if state.scanning else 'false',
+        state.current_angle,
+        state.last_distance,
+        scan_data
+    )
+
+# Receive buffer shared by all connections; only the request line is copied out
+_RECV_BUF = bytearray(1024)
+_REQ_LINE_MAX = const(64)
+
+# Command dispatch table for /cmd?action=...
+_ACTIONS = {
+    b'activate': activate_system,
+    b'deactivate': enter_sleep_mode,
+    b'forward': move_forward,
+    b'reverse': move_reverse,
+    b'left': turn_left,
+    b'right': turn_right,
+    b'stop': stop_movement,
+    b'start_scan': start_scanning,
+    b'stop_scan': stop_scanning,
+}
+
+async def serve_page(writer, query):
+    """Serve main page"""
+    await writer.awrite(HTML_PAGE_BYTES)
+
+async def serve_status(writer, query):
+    """Return status JSON"""
+    await writer.awrite('HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n')
+    await writer.awrite(get_status_json())
+
+async def serve_cmd(writer, query):
+    """Run the command in action= and return status JSON"""
+    i = query.find(b'action=')
+    if i == -1:
+        await writer.awrite('HTTP/1.1 400 Bad Request\r\n\r\n')
+        return
+    
+    i += 7
+    k = query.find(b'&', i)
+    handler = _ACTIONS.get(query[i:k] if k != -1 else query[i:])
+    if handler:
+        handler()
+    
+    await serve_status(writer, query)
+
+async def serve_events(writer, query):
+    """Stream status JSON as Server-Sent Events until the client goes away"""
+    try:
+        await writer.awrite('HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                            'Cache-Control: no-cache\r\n\r\n')
+        while True:
+            await writer.awrite('data: ' + get_status_json() + '\n\n')
+            await asyncio.sleep_ms(200)
+    except OSError:
+        pass
+
+# Route table keyed by request path
+_ROUTES = {
+    b'/': serve_page,
+    b'/index': serve_page,
+    b'/index.html': serve_page,
+    b'/status': serve_status,
+    b'/cmd': serve_cmd,
+    b'/events': serve_events,
+}
+
+# Nagle off for small responses (older lwIP builds lack the option)
+_TCP_NODELAY = getattr(socket, 'TCP_NODELAY', None)
+
+async def handle_client(reader, writer):
     """Handle HTTP request"""
     try:
-        request = client.recv(1024).decode('utf-8')
+        if _TCP_NODELAY is not None:
+            writer.s.setsockopt(socket.IPPROTO_TCP, _TCP_NODELAY, 1)
         
-        # Parse request
-        if 'GET / ' in request or 'GET /index' in request:
-            # Serve main page
-            response = HTML_PAGE
-            client.send('HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n')
-            client.send(response)
-            
-        elif 'GET /status' in request:
-            # Return status JSON
-            client.send('HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n')
-            client.send(get_status_json())
-            
-        elif 'GET /cmd' in request:
-            # Parse command
-            try:
-                action = request.split('action=')[1].split(' ')[0].split('&')[0]
-                
-                if action == 'activate':
-                    activate_system()
-                elif action == 'deactivate':
-                    enter_sleep_mode()
-                elif action == 'forward':
-                    move_forward()
-                elif action == 'reverse':
-                    move_reverse()
-                elif action == 'left':
-                    turn_left()
-                elif action == 'right':
-                    turn_right()
-                elif action == 'stop':
-                    stop_movement()
-                elif action == 'start_scan':
-                    start_scanning()
-                elif action == 'stop_scan':
-                    stop_scanning()
-                
-                client.send('HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n')
-                client.send(get_status_json())
-                
-            except:
-                client.send('HTTP/1.1 400 Bad Request\r\n\r\n')
+        n = await reader.readinto(_RECV_BUF)
+        request = bytes(memoryview(_RECV_BUF)[:min(n, _REQ_LINE_MAX)])
+        
+        # Split "GET <path>?<query> HTTP/1.1" into path and query
+        route = None
+        if request.startswith(b'GET '):
+            end = request.find(b' ', 4)
+            if end == -1:
+                end = len(request)
+            q = request.find(b'?', 4, end)
+            if q == -1:
+                route, query = _ROUTES.get(request[4:end]), b''
+            else:
+                route, query = _ROUTES.get(request[4:q]), request[q + 1:end]
+        
+        if route:
+            await route(writer, query)
         else:
-            client.send('HTTP/1.1 404 Not Found\r\n\r\n')
+            await writer.awrite('HTTP/1.1 404 Not Found\r\n\r\n')
             
     except Exception as e:
         print('Request error:', e)
     finally:
-        client.close()
-
-def start_server(ip):
-    """Start web server"""
-    addr = socket.getaddrinfo(ip, 80)[0][-1]
-    s = socket.socket()
-    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    s.bind(addr)
-    s.listen(5)
+        await writer.aclose()
+
+async def start_server(ip):
+    """Start web server alongside the radar scan task"""
+    asyncio.create_task(radar_scan_task())
+    server = await asyncio.start_server(handle_client, ip, 80)
     
     print(f'Server running on http://{ip}')
     print('Access the web interface from your browser')
     
-    while True:
-        try:
-            client, addr = s.accept()
-            handle_request(client)
-        except Exception as e:
-            print('Server error:', e)
+    await server.wait_closed()
 
 # ==================== MAIN ====================
 
@@ -697,9 +877,6 @@ def main():
     # Initialize in sleep mode
     enter_sleep_mode()
     
-    # Start radar scanning thread
-    _thread.start_new_thread(radar_scan_thread, ())
-    
     # Connect to WiFi
     ip = connect_wifi()
     
@@ -713,8 +890,8 @@ def main():
     # Back to sleep mode indicator
     red_led.value(1)
     
-    # Start web server
-    start_server(ip)
+    # Start web server and radar scanning
+    asyncio.run(start_server(ip))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
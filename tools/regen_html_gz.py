@@ -0,0 +1,44 @@
+"""
+Regenerate HTML_PAGE_GZ from HTML_PAGE in the radar script
+Run on the host (CPython) after every edit to HTML_PAGE:
+    python tools/regen_html_gz.py
+"""
+
+import ast
+import base64
+import gzip
+import os
+import re
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'Mobil Radar Python Kodu.py')
+
+def main():
+    with open(SCRIPT, encoding='utf-8', newline='') as f:
+        source = f.read()
+    nl = '\r\n' if '\r\n' in source else '\n'
+    
+    # Find the HTML_PAGE literal
+    html = None
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', '') == 'HTML_PAGE':
+            html = node.value.value
+    if html is None:
+        raise SystemExit('HTML_PAGE not found')
+    
+    # gzip -9 with a fixed mtime so the output is reproducible
+    blob = base64.b64encode(gzip.compress(html.encode(), compresslevel=9, mtime=0)).decode()
+    lines = [blob[i:i + 72] for i in range(0, len(blob), 72)]
+    block = 'HTML_PAGE_GZ = binascii.a2b_base64(' + nl
+    block += ''.join("    '%s'%s" % (line, nl) for line in lines) + ')' + nl
+    
+    source, count = re.subn(r"HTML_PAGE_GZ = binascii\.a2b_base64\(\r?\n(?:    '[^']*'\r?\n)*\)\r?\n",
+                            lambda m: block, source)
+    if count != 1:
+        raise SystemExit('HTML_PAGE_GZ block not found')
+    
+    with open(SCRIPT, 'w', encoding='utf-8', newline='') as f:
+        f.write(source)
+    print('HTML_PAGE: %d bytes, gzipped: %d bytes' % (len(html.encode()), len(blob) * 3 // 4))
+
+if __name__ == '__main__':
+    main()